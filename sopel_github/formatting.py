@@ -17,10 +17,10 @@ Copyright 2019 dgw
 
 from __future__ import annotations
 
+from collections import Counter, namedtuple
 import re
-import textwrap
 
-from sopel.formatting import color
+from sopel.formatting import CONTROL_BOLD, CONTROL_COLOR, CONTROL_NORMAL, color
 from sopel import tools
 
 try:
@@ -28,72 +28,106 @@ try:
 except ImportError:
     emojize = lambda text: text
 else:
-    emojize = lambda text: emoji.emojize(text, language='alias')
-
-current_row = None
-current_payload = None
+    # shortcodes are always :delimited:, so most text can skip the library
+    emojize = lambda text: emoji.emojize(text, language='alias') if ':' in text else text
 
 LOGGER = tools.get_logger('github')
 
 MARKDOWN_HEADING = re.compile(r'#+\s+')
-
-
-def fmt_url(s, row=None):
-    if not row:
-        row = current_row
+BRANCH_REF_PREFIX = 'refs/heads/'
+TAG_REF_PREFIX = 'refs/tags/'
+# the before/after SHA GitHub sends for a created/deleted ref (SHA-256 repos
+# pad it further, hence the prefix checks)
+NULL_SHA = '0' * 40
+# capture the abbreviated form so substitution can use a plain template
+FULL_SHA = re.compile(r'([a-f0-9]{7})[a-f0-9]{33}')
+
+OPEN_CLOSE_ACTIONS = frozenset({'opened', 'reopened', 'closed'})
+READY_ACTIONS = frozenset({'ready_for_review', 'converted_to_draft'})
+ASSIGN_ACTIONS = frozenset({'assigned', 'unassigned'})
+LABEL_ACTIONS = frozenset({'labeled', 'unlabeled'})
+MILESTONE_ACTIONS = frozenset({'milestoned', 'demilestoned'})
+# (verb, preposition) for describing each action
+LABEL_ACTION_WORDS = {'labeled': ('added', 'to'), 'unlabeled': ('removed', 'from')}
+MILESTONE_ACTION_WORDS = {'milestoned': ('added', 'to'), 'demilestoned': ('removed', 'from')}
+
+# destructive push actions are always shown in red, regardless of hook colors
+PUSH_DELETED = CONTROL_COLOR + '04deleted' + CONTROL_NORMAL
+PUSH_FORCED = CONTROL_COLOR + '04force-pushed' + CONTROL_NORMAL
+
+
+def fmt_url(s, row):
     return color(s, fg=row[3])
 
 
-def fmt_tag(s, row=None):
-    if not row:
-        row = current_row
+def fmt_tag(s, row):
     return color(s, fg=row[4])
 
 
-def fmt_repo(s, row=None):
-    if not row:
-        row = current_row
+def fmt_repo(s, row):
     return color(s, fg=row[5])
 
 
-def fmt_name(s, row=None):
-    if not row:
-        row = current_row
+def fmt_name(s, row):
     return color(s, fg=row[6])
 
 
-def fmt_hash(s, row=None):
-    if not row:
-        row = current_row
+def fmt_hash(s, row):
     return color(s, fg=row[7])
 
 
-def fmt_branch(s, row=None):
-    if not row:
-        row = current_row
+def fmt_branch(s, row):
     return color(s, fg=row[8])
 
 
+RowFormatters = namedtuple('RowFormatters', ['url', 'tag', 'repo', 'name', 'hash', 'branch'])
+
+
+def bind_row(row):
+    """
+    Pre-bind a hook row's colors, giving row-less versions of the fmt_* helpers above.
+    """
+    # the color code (and color() itself) ride along as default arguments, so
+    # calls pass no keywords and do no global lookups
+    return RowFormatters(*(lambda s, fg=fg, color=color: color(s, fg) for fg in row[3:9]))
+
+
 def fmt_short_comment_body(body):
     if body is None or body.strip() == '':
         return '(empty comment)'
 
-    lines = [
-        line.strip()
-        for line in body.splitlines()
-        if line
-        and line[0] != '>'  # Markdown quote
-        and not MARKDOWN_HEADING.match(line)  # Markdown heading
-        and not line.startswith('<!-')  # commented out HTML-style
-    ]
+    # Most comments are a single short line with no Markdown to skip over.
+    # Non-printable characters include every line break splitlines() knows
+    # about, so anything containing one takes the long way.
+    if len(body) <= 250 and body.isprintable() and body[0] not in '>#<':
+        return FULL_SHA.sub(r'\1', body.strip())
+
+    lines = []
+    for line in body.splitlines():
+        stripped = line.strip()
+        if (
+            not stripped  # blank, or whitespace only
+            or line[0] == '>'  # Markdown quote
+            or (line[0] == '#' and MARKDOWN_HEADING.match(line))  # Markdown heading
+            or line.startswith('<!-')  # commented out HTML-style
+        ):
+            continue
+        lines.append(stripped)
+        if len(lines) > 1:
+            # only the first line is shown; we just need to know there's more
+            break
     # if there's nothing left, the comment is "empty"
     if not lines:
         return '(no body text)'
 
     # abbreviate commit hashes in the text
-    line = re.sub(r'[a-f0-9]{40}', lambda m: m.group(0)[:7], lines[0])
-    # wrap text to get a line of at most 250 chars
-    short = textwrap.wrap(line, 250)[0]
+    line = FULL_SHA.sub(r'\1', lines[0])
+    # cut to at most 250 chars, at the last word boundary if there is one
+    if len(line) <= 250:
+        short = line
+    else:
+        cut = line.rfind(' ', 0, 251)
+        short = line[:cut].rstrip() if cut > 0 else line[:250]
     # add continuation marker if needed
     if len(lines) > 1 or short != line:
         short += ' […]'
@@ -101,78 +135,69 @@ def fmt_short_comment_body(body):
     return short
 
 
-def get_distinct_commits(payload=None):
-    if not payload:
-        payload = current_payload
+def get_distinct_commits(payload):
     if 'distinct_commits' in payload:
         return payload['distinct_commits']
-    commits = []
-    for commit in payload['commits']:
-        if commit['distinct'] and len(commit['message'].strip()) > 0:
-            commits.append(commit)
+    commits = [commit for commit in payload['commits'] if commit['distinct'] and commit['message'].strip()]
+    # several formatters need this list; only build it once per payload
+    payload['distinct_commits'] = commits
     return commits
 
 
-def get_ref_name(payload=None):
-    if not payload:
-        payload = current_payload
-    return re.sub(r'^refs/(heads|tags)/', '', payload['ref'])
+def strip_ref_prefix(ref):
+    if ref.startswith(BRANCH_REF_PREFIX):
+        return ref[len(BRANCH_REF_PREFIX):]
+    if ref.startswith(TAG_REF_PREFIX):
+        return ref[len(TAG_REF_PREFIX):]
+    return ref
+
 
+def get_ref_name(payload):
+    if 'ref_name' not in payload:
+        payload['ref_name'] = strip_ref_prefix(payload['ref'])
+    return payload['ref_name']
 
-def get_base_ref_name(payload=None):
-    if not payload:
-        payload = current_payload
-    return re.sub(r'^refs/(heads|tags)/', '', payload['base_ref'])
 
+def get_base_ref_name(payload):
+    return strip_ref_prefix(payload['base_ref'])
 
-def get_pusher(payload=None):
-    if not payload:
-        payload = current_payload
+
+def get_pusher(payload):
     return payload['pusher']['name'] if 'pusher' in payload else 'somebody'
 
 
-def get_repo_name(payload=None):
-    if not payload:
-        payload = current_payload
+def get_repo_name(payload):
     return payload['repository']['name']
 
 
-def get_after_sha(payload=None):
-    if not payload:
-        payload = current_payload
-    return payload['after'][0:7]
-
+def get_after_sha(payload):
+    # the payload is formatted once per subscribed channel; slice only once
+    if 'after_sha' not in payload:
+        payload['after_sha'] = payload['after'][0:7]
+    return payload['after_sha']
 
-def get_before_sha(payload=None):
-    if not payload:
-        payload = current_payload
-    return payload['before'][0:7]
 
+def get_before_sha(payload):
+    if 'before_sha' not in payload:
+        payload['before_sha'] = payload['before'][0:7]
+    return payload['before_sha']
 
-def get_push_summary_url(payload=None):
-    if not payload:
-        payload = current_payload
 
+def get_push_summary_url(payload, distinct):
     repo_url = payload['repository']['url']
-    if payload['created'] or re.match(r'0{40}', payload['before']):
-        if len(get_distinct_commits()) < 0:
-            return repo_url + "/commits/" + get_ref_name()
-        else:
-            return payload['compare']
+    if payload['created'] or payload['before'].startswith(NULL_SHA):
+        return payload['compare']
     elif payload['deleted']:
-        return repo_url + "/commit/" + get_before_sha()
+        return repo_url + "/commit/" + get_before_sha(payload)
     elif payload['forced']:
-        return repo_url + "/commits/" + get_ref_name()
-    elif len(get_distinct_commits()) == 1:
-        return get_distinct_commits()[0]['url']
+        return repo_url + "/commits/" + get_ref_name(payload)
+    elif len(distinct) == 1:
+        return distinct[0]['url']
     else:
         return payload['compare']
 
 
-def get_issue_type(payload=None):
-    if not payload:
-        payload = current_payload
-
+def get_issue_type(payload):
     is_pr = ('pull_request' in payload or ('issue' in payload and '/pull/' in payload['issue']['html_url']))
 
     if is_pr:
@@ -181,230 +206,157 @@ def get_issue_type(payload=None):
         return "issue"
 
 
-def get_issue_or_pr_number(payload=None):
-    if not payload:
-        payload = current_payload
-
-    try:
-        number = payload['issue']['number']
-    except KeyError:
-        number = payload['pull_request']['number']
+def get_issue_or_pr(payload):
+    return payload.get('issue') or payload['pull_request']
 
-    return number
 
+def get_issue_or_pr_number(payload):
+    return get_issue_or_pr(payload)['number']
 
-def get_issue_or_pr_title(payload=None):
-    if not payload:
-        payload = current_payload
 
-    try:
-        title = payload['issue']['title']
-    except KeyError:
-        title = payload['pull_request']['title']
+def get_issue_or_pr_title(payload):
+    return get_issue_or_pr(payload)['title']
 
-    return title
 
+def fmt_push_summary_message(payload, fmt, repo, distinct):
+    header = f"[{repo}] {fmt.name(get_pusher(payload))}"
+    ref_name = get_ref_name(payload)
+    num = len(distinct)
 
-def fmt_push_summary_message(payload=None, row=None):
-    if not payload:
-        payload = current_payload
-    if not row:
-        row = current_row
-
-    message = []
-    message.append("[{}] {}".format(fmt_repo(get_repo_name()), fmt_name(get_pusher())))
-
-    if payload['created'] or re.match(r'0{40}', payload['before']):
-        if re.match(r'^refs/tags/', payload['ref']):
-            message.append('tagged {} at'.format(fmt_tag(get_ref_name())))
-            message.append(fmt_branch(get_base_ref_name()) if payload['base_ref'] else fmt_hash(get_after_sha()))
-        else:
-            message.append('created {}'.format(fmt_branch(get_ref_name())))
+    if payload['created'] or payload['before'].startswith(NULL_SHA):
+        if payload['ref'].startswith(TAG_REF_PREFIX):
+            target = fmt.branch(get_base_ref_name(payload)) if payload['base_ref'] else fmt.hash(get_after_sha(payload))
+            return f"{header} tagged {fmt.tag(ref_name)} at {target}"
 
-            if payload['base_ref']:
-                message.append('from {}'.format(fmt_branch(get_base_ref_name())))
-            elif len(get_distinct_commits()) == 0:
-                message.append('at {}'.format(fmt_hash(get_after_sha())))
+        origin = ''
+        if payload['base_ref']:
+            origin = f" from {fmt.branch(get_base_ref_name(payload))}"
+        elif num == 0:
+            origin = f" at {fmt.hash(get_after_sha(payload))}"
 
-            num = len(get_distinct_commits())
-            message.append('(+\002{}\017 new commit{})'.format(num, 's' if num > 1 else ''))
+        return f"{header} created {fmt.branch(ref_name)}{origin} (+{CONTROL_BOLD}{num}{CONTROL_NORMAL} new commit{'s' if num > 1 else ''})"
 
-    elif payload['deleted'] or re.match(r'0{40}', payload['after']):
-        message.append("\00304deleted\017 {} at {}".format(fmt_branch(get_ref_name()), fmt_hash(get_before_sha())))
+    elif payload['deleted'] or payload['after'].startswith(NULL_SHA):
+        return f"{header} {PUSH_DELETED} {fmt.branch(ref_name)} at {fmt.hash(get_before_sha(payload))}"
 
     elif payload['forced']:
-        message.append("\00304force-pushed\017 {} from {} to {}".format(
-                       fmt_branch(get_ref_name()), fmt_hash(get_before_sha()), fmt_hash(get_after_sha())))
+        return (f"{header} {PUSH_FORCED} {fmt.branch(ref_name)} "
+                f"from {fmt.hash(get_before_sha(payload))} to {fmt.hash(get_after_sha(payload))}")
 
-    elif len(payload['commits']) > 0 and len(get_distinct_commits()) == 0:
+    elif len(payload['commits']) > 0 and num == 0:
         if payload['base_ref']:
-            message.append('merged {} into {}'.format(fmt_branch(get_base_ref_name()), fmt_branch(get_ref_name())))
-        else:
-            message.append('fast-forwarded {} from {} to {}'.format(
-                           fmt_branch(get_ref_name()), fmt_hash(get_before_sha()), fmt_hash(get_after_sha())))
-
-    else:
-        num = len(get_distinct_commits())
-        message.append("pushed \002{}\017 new commit{} to {}".format(num, 's' if num > 1 else '', fmt_branch(get_ref_name())))
+            return f"{header} merged {fmt.branch(get_base_ref_name(payload))} into {fmt.branch(ref_name)}"
+        return (f"{header} fast-forwarded {fmt.branch(ref_name)} "
+                f"from {fmt.hash(get_before_sha(payload))} to {fmt.hash(get_after_sha(payload))}")
 
-    return ' '.join(message)
+    return f"{header} pushed {CONTROL_BOLD}{num}{CONTROL_NORMAL} new commit{'s' if num > 1 else ''} to {fmt.branch(ref_name)}"
 
 
-def fmt_commit_message(commit):
-    short = commit['message'].splitlines()[0]
-    short = short + '…' if short != commit['message'] else short
+def fmt_commit_message(commit, fmt, repo_branch):
+    # repo_branch is the already-colored "repo/branch" prefix, which is the
+    # same for every commit in a push
+    message = commit['message']
+    # the first line ends at the first '\n' at the latest, but may end sooner
+    # at a lone '\r' or a Unicode line break, as with splitlines()
+    end = message.find('\n')
+    head = message if end < 0 else message[:end]
+    first = head.splitlines()[0] if head else ''
+    short = first if first == message else first + '…'
 
     author = commit['author']['name']
-    sha = commit['id']
-
-    return '{}/{} {} {}: {}'.format(fmt_repo(get_repo_name()), fmt_branch(get_ref_name()), fmt_hash(sha[0:7]), fmt_name(author), short)
+    sha7 = commit['id'][0:7]
 
+    return f"{repo_branch} {fmt.hash(sha7)} {fmt.name(author)}: {short}"
 
-def fmt_commit_comment_summary(payload=None, row=None):
-    if not payload:
-        payload = current_payload
-    if not row:
-        row = current_row
 
+def fmt_commit_comment_summary(payload, fmt, repo):
     short = fmt_short_comment_body(payload['comment']['body'])
-    return '[{}] {} commented on commit {}: {}'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  fmt_hash(payload['comment']['commit_id'][0:7]),
-                  emojize(short))
-
-
-def fmt_issue_summary_message(payload=None):
-    if not payload:
-        payload = current_payload
-    return '[{}] {} {} issue #{}: {}'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  payload['action'],
-                  payload['issue']['number'],
-                  emojize(payload['issue']['title']))
-
-
-def fmt_issue_incoming_transfer_message(payload=None):
-    if not payload:
-        payload = current_payload
+    return (f"[{repo}] {fmt.name(payload['sender']['login'])} commented on commit "
+            f"{fmt.hash(payload['comment']['commit_id'][0:7])}: {emojize(short)}")
+
+
+def fmt_issue_summary_message(payload, fmt, repo):
+    issue = payload['issue']
+    return (f"[{repo}] {fmt.name(payload['sender']['login'])} {payload['action']} "
+            f"issue #{issue['number']}: {emojize(issue['title'])}")
+
+
+def fmt_issue_incoming_transfer_message(payload, fmt, repo):
     # GitHub unfortunately doesn't seem to include any info about the user who
     # initiated the issue transfer, only the original author/creator.
-    return '[{}] {}#{} by {} was transferred to issue #{}: {}'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_repo(payload['changes']['old_repository']['full_name']),
-                  payload['changes']['old_issue']['number'],
-                  fmt_name(payload['issue']['user']['login']),
-                  payload['issue']['number'],
-                  emojize(payload['issue']['title']))
-
-
-def fmt_issue_outgoing_transfer_message(payload=None):
-    if not payload:
-        payload = current_payload
+    issue = payload['issue']
+    changes = payload['changes']
+    return (f"[{repo}] {fmt.repo(changes['old_repository']['full_name'])}#{changes['old_issue']['number']} "
+            f"by {fmt.name(issue['user']['login'])} was transferred to issue #{issue['number']}: "
+            f"{emojize(issue['title'])}")
+
+
+def fmt_issue_outgoing_transfer_message(payload, fmt, repo):
     # For "transferred" events (sent for the source repo only), GitHub DOES set
     # the "sender" info to the user who initiated the transfer, unlike for
     # inbound transfer hooks (which just look like any other "opened" event
     # except for the addition of a "changes" object).
-    return '[{}] {} transferred issue #{} by {} to {}#{}: {}'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  payload['issue']['number'],
-                  fmt_name(payload['issue']['user']['login']),
-                  fmt_repo(payload['changes']['new_repository']['full_name']),
-                  payload['changes']['new_issue']['number'],
-                  emojize(payload['issue']['title']))
-
-
-def fmt_issue_title_edit(payload=None):
-    if not payload:
-        payload = current_payload
-    return '[{}] {} retitled issue #{}: "{}" ➜ "{}"'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  payload['issue']['number'],
-                  emojize(payload['changes']['title']['from']),
-                  emojize(payload['issue']['title']))
-
-
-def fmt_issue_assignee_message(payload=None):
-    if not payload:
-        payload = current_payload
+    issue = payload['issue']
+    changes = payload['changes']
+    return (f"[{repo}] {fmt.name(payload['sender']['login'])} transferred issue #{issue['number']} "
+            f"by {fmt.name(issue['user']['login'])} to "
+            f"{fmt.repo(changes['new_repository']['full_name'])}#{changes['new_issue']['number']}: "
+            f"{emojize(issue['title'])}")
+
 
+def fmt_issue_title_edit(payload, fmt, repo):
+    return (f"[{repo}] {fmt.name(payload['sender']['login'])} retitled issue #{payload['issue']['number']}: "
+            f"\"{emojize(payload['changes']['title']['from'])}\" ➜ \"{emojize(payload['issue']['title'])}\"")
+
+
+def fmt_issue_assignee_message(payload, fmt, repo):
+    issue = get_issue_or_pr(payload)
+    action = payload['action']
+    sender = payload['sender']['login']
     target = ''
     assignee = payload['assignee']['login']
     self_assign = False
 
-    if assignee == payload['sender']['login']:
+    if assignee == sender:
         self_assign = True
     else:
-        prep = 'to' if payload['action'] == 'assigned' else 'from'
-        target = ' {} {}'.format(prep, fmt_name(assignee))
-
-    return '[{}] {} {}{} {} #{}{} ({})'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  'self-' if self_assign else '',
-                  payload['action'],
-                  get_issue_type(payload),
-                  get_issue_or_pr_number(payload),
-                  target,
-                  get_issue_or_pr_title(payload))
-
-
-def fmt_issue_label_message(payload=None):
-    if not payload:
-        payload = current_payload
-    return '[{}] {} {} the label \'{}\' {} {} #{} ({})'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  'added' if payload['action'] == 'labeled' else 'removed',
-                  payload['label']['name'],
-                  'to' if payload['action'] == 'labeled' else 'from',
-                  get_issue_type(payload),
-                  get_issue_or_pr_number(payload),
-                  get_issue_or_pr_title(payload))
-
-
-def fmt_issue_milestone_message(payload=None):
-    if not payload:
-        payload = current_payload
-
-    added = payload['action'] == 'milestoned'
-
-    return '[{}] {} {} {} #{} ({}) {} the {} milestone'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  'added' if added else 'removed',
-                  get_issue_type(payload),
-                  get_issue_or_pr_number(payload),
-                  get_issue_or_pr_title(payload),
-                  'to' if added else 'from',
-                  payload['milestone']['title'])
-
-
-def fmt_issue_comment_summary_message(payload=None):
-    if not payload:
-        payload = current_payload
+        prep = 'to' if action == 'assigned' else 'from'
+        target = f" {prep} {fmt.name(assignee)}"
+
+    return (f"[{repo}] {fmt.name(sender)} {'self-' if self_assign else ''}{action} "
+            f"{get_issue_type(payload)} #{issue['number']}{target} ({issue['title']})")
+
+
+def fmt_issue_label_message(payload, fmt, repo):
+    issue = get_issue_or_pr(payload)
+    verb, prep = LABEL_ACTION_WORDS[payload['action']]
+    return (f"[{repo}] {fmt.name(payload['sender']['login'])} {verb} "
+            f"the label '{payload['label']['name']}' {prep} "
+            f"{get_issue_type(payload)} #{issue['number']} ({issue['title']})")
 
+
+def fmt_issue_milestone_message(payload, fmt, repo):
+    issue = get_issue_or_pr(payload)
+    verb, prep = MILESTONE_ACTION_WORDS[payload['action']]
+
+    return (f"[{repo}] {fmt.name(payload['sender']['login'])} {verb} "
+            f"{get_issue_type(payload)} #{issue['number']} ({issue['title']}) "
+            f"{prep} the {payload['milestone']['title']} milestone")
+
+
+def fmt_issue_comment_summary_message(payload, fmt, repo):
     issue_type = get_issue_type(payload)
     short = fmt_short_comment_body(payload['comment']['body'])
-    return '[{}] {} commented on {} #{}: {}'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  issue_type,
-                  payload['issue']['number'],
-                  emojize(short))
-
+    return (f"[{repo}] {fmt.name(payload['sender']['login'])} commented on {issue_type} "
+            f"#{payload['issue']['number']}: {emojize(short)}")
 
-def fmt_pull_request_summary_message(payload=None):
-    if not payload:
-        payload = current_payload
 
+def fmt_pull_request_summary_message(payload, fmt, repo):
+    pr = payload['pull_request']
     action = payload['action']
-    if action == 'closed' and payload['pull_request']['merged']:
+    if action == 'closed' and pr['merged']:
         action = 'merged'
-    elif action == 'opened' and payload['pull_request'].get('draft', False):
+    elif action == 'opened' and pr.get('draft', False):
         action = 'drafted'
     elif action == 'ready_for_review':
         action = 'readied'
@@ -412,236 +364,251 @@ def fmt_pull_request_summary_message(payload=None):
         action = 'un-readied'
 
     actor = payload['sender']['login']
-    author = payload['pull_request']['user']['login']
+    author = pr['user']['login']
     maybe_possessive = ''
     if action == 'merged' and actor != author:
-        maybe_possessive = '%s\'s ' % fmt_name(author)
+        maybe_possessive = f"{fmt.name(author)}'s "
 
-    base = fmt_branch(payload['pull_request']['base']['ref'])
-    head = fmt_branch(payload['pull_request']['head']['ref'])
-    base_repo = payload['pull_request']['base']['user']['login']
-    head_repo = payload['pull_request']['head']['user']['login']
+    base = fmt.branch(pr['base']['ref'])
+    head = fmt.branch(pr['head']['ref'])
+    base_repo = pr['base']['user']['login']
+    head_repo = pr['head']['user']['login']
     if base_repo != head_repo:
-        base = "{}:{}".format(fmt_name(base_repo), base)
-        head = "{}:{}".format(fmt_name(head_repo), head)
-
-    return '[{}] {} {} {}pull request #{}: {} ({}...{})'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(actor),
-                  action,
-                  maybe_possessive,
-                  payload['pull_request']['number'],
-                  emojize(payload['pull_request']['title']),
-                  base,
-                  head)
-
-
-def fmt_pull_request_title_edit(payload=None):
-    if not payload:
-        payload = current_payload
-    return '[{}] {} retitled PR #{}: "{}" ➜ "{}"'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  payload['pull_request']['number'],
-                  emojize(payload['changes']['title']['from']),
-                  emojize(payload['pull_request']['title']))
-
-
-def fmt_pull_request_review_summary_message(payload=None):
-    if not payload:
-        payload = current_payload
-
-    action = payload['review']['state']
+        base = f"{fmt.name(base_repo)}:{base}"
+        head = f"{fmt.name(head_repo)}:{head}"
+
+    return (f"[{repo}] {fmt.name(actor)} {action} {maybe_possessive}pull request "
+            f"#{pr['number']}: {emojize(pr['title'])} ({base}...{head})")
+
+
+def fmt_pull_request_title_edit(payload, fmt, repo):
+    return (f"[{repo}] {fmt.name(payload['sender']['login'])} retitled PR #{payload['pull_request']['number']}: "
+            f"\"{emojize(payload['changes']['title']['from'])}\" ➜ \"{emojize(payload['pull_request']['title'])}\"")
+
+
+def fmt_pull_request_review_summary_message(payload, fmt, repo):
+    review = payload['review']
+    action = review['state']
     if action == 'commented':
         action = 'left a review on'
     elif action == 'changes_requested':
         action = 'requested changes on'
 
-    body = payload['review']['body']
+    body = review['body']
     short = ''
     if body:
         short = fmt_short_comment_body(body)
         short = ': ' + short
 
-    return '[{}] {} {} pull request #{}{}'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  action,
-                  payload['pull_request']['number'],
-                  emojize(short))
-
+    return (f"[{repo}] {fmt.name(payload['sender']['login'])} {action} pull request "
+            f"#{payload['pull_request']['number']}{emojize(short)}")
 
-def fmt_pull_request_review_dismissal_message(payload=None):
-    if not payload:
-        payload = current_payload
 
-    if payload['sender']['login'] == payload['review']['user']['login']:
+def fmt_pull_request_review_dismissal_message(payload, fmt, repo):
+    sender = payload['sender']['login']
+    reviewer = payload['review']['user']['login']
+    if sender == reviewer:
         whose = 'their'
     else:
-        whose = fmt_name(payload['review']['user']['login']) + '\'s'
+        whose = fmt.name(reviewer) + '\'s'
 
-    return '[{}] {} dismissed {} review on pull request #{}'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  whose,
-                  payload['pull_request']['number'])
+    return (f"[{repo}] {fmt.name(sender)} dismissed {whose} review on pull request "
+            f"#{payload['pull_request']['number']}")
 
 
-def fmt_pull_request_review_comment_summary_message(payload=None):
-    if not payload:
-        payload = current_payload
+def fmt_pull_request_review_comment_summary_message(payload, fmt, repo):
     short = fmt_short_comment_body(payload['comment']['body'])
     sha1 = payload['comment']['commit_id']
-    return '[{}] {} left a file comment in pull request #{} {}: {}'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  payload['pull_request']['number'],
-                  fmt_hash(sha1[0:7]),
-                  emojize(short))
+    return (f"[{repo}] {fmt.name(payload['sender']['login'])} left a file comment in pull request "
+            f"#{payload['pull_request']['number']} {fmt.hash(sha1[0:7])}: {emojize(short)}")
 
 
-def fmt_gollum_summary_message(payload=None):
-    if not payload:
-        payload = current_payload
+def fmt_gollum_summary_message(payload, fmt, repo):
     if len(payload['pages']) == 1:
-        summary = None
-        if 'summary' in payload['pages'][0]:
-            summary = payload['pages'][0]['summary']
-
-        return '[{}] {} {} wiki page {}{}'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  payload['pages'][0]['action'],
-                  payload['pages'][0]['title'],
-                  ": " + summary if summary else '')
+        page = payload['pages'][0]
+        summary = page.get('summary')
+
+        return (f"[{repo}] {fmt.name(payload['sender']['login'])} {page['action']} wiki page "
+                f"{page['title']}{': ' + summary if summary else ''}")
     elif len(payload['pages']) > 1:
-        counts = {}
-        for page in payload['pages']:
-            # Set default value to 0 and increment 1, only incrementing if key already exists
-            counts[page['action']] = counts.setdefault(page['action'], 0) + 1
-        actions = []
-        for action, count in counts.items():
-            actions.append(action + " " + count)
+        counts = Counter(page['action'] for page in payload['pages'])
+        actions = sorted(f"{action} {count}" for action, count in counts.items())
 
-        return '[{}] {} {} wiki pages'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']),
-                  fmt_arr_to_sentence(actions.sort()))
+        return f"[{repo}] {fmt.name(payload['sender']['login'])} {fmt_arr_to_sentence(actions)} wiki pages"
 
 
 def fmt_arr_to_sentence(seq):
     if len(seq) <= 2:
         return ' and '.join(seq)
     else:
-        return '{}, and {}'.format(', '.join(seq[:-1]), seq[-1])
+        return f"{', '.join(seq[:-1])}, and {seq[-1]}"
 
 
-def fmt_watch_message(payload=None):
-    if not payload:
-        payload = current_payload
-    return '[{}] {} starred the project!'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_name(payload['sender']['login']))
+def fmt_watch_message(payload, fmt, repo):
+    return f"[{repo}] {fmt.name(payload['sender']['login'])} starred the project!"
 
 
-def fmt_status_message(payload=None):
-    if not payload:
-        payload = current_payload
-    branch = ''
-    for br in payload['branches']:
-        if br['commit']['sha'] == payload['sha']:
-            branch = br['name']
-    return '[{}/{}] {} - {} ({})'.format(
-                  fmt_repo(payload['repository']['name']),
-                  fmt_branch(branch),
-                  payload['description'],
-                  payload['target_url'],
-                  payload['state'])
+def fmt_status_message(payload, fmt, repo):
+    sha = payload['sha']
+    branch = next((br['name'] for br in payload['branches'] if br['commit']['sha'] == sha), '')
+    return f"[{repo}/{fmt.branch(branch)}] {payload['description']} - {payload['target_url']} ({payload['state']})"
 
 
-def fmt_release_message(payload=None):
-    if not payload:
-        payload = current_payload
+def fmt_release_message(payload, fmt, repo):
+    release = payload['release']
+    return (f"[{repo}] {fmt.name(release['author']['login'])} released "
+            f"{release['name'] or release['tag_name']}{' (prerelease)' if release['prerelease'] else ''}")
 
-    return '[{}] {} released {}{}'.format(
-        fmt_repo(payload['repository']['name']),
-        fmt_name(payload['release']['author']['login']),
-        payload['release']['name'] or payload['release']['tag_name'],
-        ' (prerelease)' if payload['release']['prerelease'] else '')
 
+def handle_push(payload, fmt, repo):
+    distinct = get_distinct_commits(payload)
+    summary = fmt_push_summary_message(payload, fmt, repo, distinct)
+    messages = [summary + " " + fmt.url(get_push_summary_url(payload, distinct))]
+    repo_branch = repo + '/' + fmt.branch(get_ref_name(payload))
+    for commit in distinct:
+        messages.append(fmt_commit_message(commit, fmt, repo_branch))
+    return messages
 
-def get_formatted_response(payload, row):
-    global current_row, current_payload
-    current_payload = payload
-    current_row = row
 
-    messages = []
-    if payload['event'] == 'push':
-        messages.append(fmt_push_summary_message() + " " + fmt_url(get_push_summary_url()))
-        for commit in get_distinct_commits():
-            messages.append(fmt_commit_message(commit))
-    elif payload['event'] == 'commit_comment':
-        messages.append(fmt_commit_comment_summary() + " " + fmt_url(payload['comment']['html_url']))
-    elif payload['event'] == 'pull_request':
-        if re.match('((re)?open|clos)ed', payload['action']) or payload['action'] in ['ready_for_review', 'converted_to_draft']:
-            messages.append(fmt_pull_request_summary_message() + " " + fmt_url(payload['pull_request']['html_url']))
-        elif payload['action'] == 'edited':
-            if 'changes' in payload:
-                if 'title' in payload['changes']:
-                    messages.append(fmt_pull_request_title_edit() + " " + fmt_url(payload['pull_request']['html_url']))
-        elif re.match('(assigned|unassigned)', payload['action']):
-            messages.append(fmt_issue_assignee_message() + " " + fmt_url(payload['pull_request']['html_url']))
-        elif re.match('(labeled|unlabeled)', payload['action']):
-            if payload.get('label', None):
-                # If a label is deleted, for example, we'll get a webhook payload with no details about the removed label.
-                # We skip those; there's no reason to emit action messages to IRC with "unknown label" placeholders.
-                messages.append(fmt_issue_label_message() + " " + fmt_url(payload['pull_request']['html_url']))
-    elif payload['event'] == 'pull_request_review':
-        if payload['action'] == 'submitted' and payload['review']['state'] in ['approved', 'changes_requested', 'commented']:
-            if payload['review']['state'] == 'commented' and payload['review']['body'] is None:
-                # Probably an empty "review" fired by a pull_request_review_comment reply, which we'll get in a separate hook delivery.
-                # Wish GitHub didn't fire both events, but they do, even though it makes no sense.
-                # Either way, an empty review must be accompanied by comments, which will get handled when their hook(s) fire(s).
-                pass
-            else:
-                messages.append(fmt_pull_request_review_summary_message() + " " + fmt_url(payload['review']['html_url']))
-        elif payload['action'] == 'dismissed':
-            messages.append(fmt_pull_request_review_dismissal_message() + " " + fmt_url(payload['review']['html_url']))
-    elif payload['event'] == 'pull_request_review_comment' and payload['action'] == 'created':
-        messages.append(fmt_pull_request_review_comment_summary_message() + " " + fmt_url(payload['comment']['html_url']))
-    elif payload['event'] == 'issues':
-        if re.match('((re)?open|clos)ed', payload['action']):
-            if 'changes' in payload and all(k in payload['changes'] for k in ['old_repository', 'old_issue']):
-                messages.append(fmt_issue_incoming_transfer_message() + " " + fmt_url(payload['issue']['html_url']))
-            else:
-                messages.append(fmt_issue_summary_message() + " " + fmt_url(payload['issue']['html_url']))
-        elif re.match('(assigned|unassigned)', payload['action']):
-            messages.append(fmt_issue_assignee_message() + " " + fmt_url(payload['issue']['html_url']))
-        elif re.match('(labeled|unlabeled)', payload['action']):
-            if payload.get('label', None):
-                # If a label is deleted, for example, we'll get a webhook payload with no details about the removed label.
-                # We skip those; there's no reason to emit action messages to IRC with "unknown label" placeholders.
-                messages.append(fmt_issue_label_message() + " " + fmt_url(payload['issue']['html_url']))
-        elif re.match('(milestoned|demilestoned)', payload['action']):
-            messages.append(fmt_issue_milestone_message() + " " + fmt_url(payload['issue']['html_url']))
-        elif payload['action'] == 'edited':
-            if 'changes' in payload:
-                if 'title' in payload['changes']:
-                    messages.append(fmt_issue_title_edit() + " " + fmt_url(payload['issue']['html_url']))
-        elif payload['action'] == 'transferred':
-            messages.append(fmt_issue_outgoing_transfer_message() + " " + fmt_url(payload['changes']['new_issue']['html_url']))
-    elif payload['event'] == 'issue_comment' and payload['action'] == 'created':
-        messages.append(fmt_issue_comment_summary_message() + " " + fmt_url(payload['comment']['html_url']))
-    elif payload['event'] == 'gollum':
-        url = payload['pages'][0]['html_url'] if len(payload['pages']) else payload['repository']['url'] + '/wiki'
-        messages.append(fmt_gollum_summary_message() + " " + fmt_url(url))
-    elif payload['event'] == 'watch':
-        messages.append(fmt_watch_message())
-    elif payload['event'] == 'status':
-        messages.append(fmt_status_message())
-    elif payload['event'] == 'release':
-        if payload['action'] == 'published':
-            # Currently the only possible action, but other events might eventually fire webhooks too
-            messages.append(fmt_release_message() + " " + fmt_url(payload['release']['html_url']))
+def handle_commit_comment(payload, fmt, repo):
+    return [fmt_commit_comment_summary(payload, fmt, repo) + " " + fmt.url(payload['comment']['html_url'])]
+
+
+def handle_pull_request_state(payload, fmt, repo):
+    return [fmt_pull_request_summary_message(payload, fmt, repo) + " " + fmt.url(payload['pull_request']['html_url'])]
+
+
+def handle_pull_request_edit(payload, fmt, repo):
+    if 'title' not in payload.get('changes', ()):
+        return []
+    return [fmt_pull_request_title_edit(payload, fmt, repo) + " " + fmt.url(payload['pull_request']['html_url'])]
+
+
+def handle_issue_state(payload, fmt, repo):
+    if 'changes' in payload and all(k in payload['changes'] for k in ['old_repository', 'old_issue']):
+        return [fmt_issue_incoming_transfer_message(payload, fmt, repo) + " " + fmt.url(payload['issue']['html_url'])]
+    return [fmt_issue_summary_message(payload, fmt, repo) + " " + fmt.url(payload['issue']['html_url'])]
+
+
+def handle_issue_edit(payload, fmt, repo):
+    if 'title' not in payload.get('changes', ()):
+        return []
+    return [fmt_issue_title_edit(payload, fmt, repo) + " " + fmt.url(payload['issue']['html_url'])]
 
+
+def handle_issue_transfer(payload, fmt, repo):
+    return [fmt_issue_outgoing_transfer_message(payload, fmt, repo) + " " + fmt.url(payload['changes']['new_issue']['html_url'])]
+
+
+def handle_assignment(payload, fmt, repo):
+    return [fmt_issue_assignee_message(payload, fmt, repo) + " " + fmt.url(get_issue_or_pr(payload)['html_url'])]
+
+
+def handle_labeling(payload, fmt, repo):
+    if not payload.get('label', None):
+        # If a label is deleted, for example, we'll get a webhook payload with no details about the removed label.
+        # We skip those; there's no reason to emit action messages to IRC with "unknown label" placeholders.
+        return []
+    return [fmt_issue_label_message(payload, fmt, repo) + " " + fmt.url(get_issue_or_pr(payload)['html_url'])]
+
+
+def handle_milestoning(payload, fmt, repo):
+    return [fmt_issue_milestone_message(payload, fmt, repo) + " " + fmt.url(payload['issue']['html_url'])]
+
+
+def handle_pull_request(payload, fmt, repo):
+    handler = PULL_REQUEST_ACTION_HANDLERS.get(payload['action'])
+    return handler(payload, fmt, repo) if handler else []
+
+
+def handle_pull_request_review(payload, fmt, repo):
+    action = payload['action']
+    messages = []
+    if action == 'submitted' and payload['review']['state'] in ['approved', 'changes_requested', 'commented']:
+        if payload['review']['state'] == 'commented' and payload['review']['body'] is None:
+            # Probably an empty "review" fired by a pull_request_review_comment reply, which we'll get in a separate hook delivery.
+            # Wish GitHub didn't fire both events, but they do, even though it makes no sense.
+            # Either way, an empty review must be accompanied by comments, which will get handled when their hook(s) fire(s).
+            pass
+        else:
+            messages.append(fmt_pull_request_review_summary_message(payload, fmt, repo) + " " + fmt.url(payload['review']['html_url']))
+    elif action == 'dismissed':
+        messages.append(fmt_pull_request_review_dismissal_message(payload, fmt, repo) + " " + fmt.url(payload['review']['html_url']))
     return messages
+
+
+def handle_pull_request_review_comment(payload, fmt, repo):
+    if payload['action'] != 'created':
+        return []
+    return [fmt_pull_request_review_comment_summary_message(payload, fmt, repo) + " " + fmt.url(payload['comment']['html_url'])]
+
+
+def handle_issues(payload, fmt, repo):
+    handler = ISSUE_ACTION_HANDLERS.get(payload['action'])
+    return handler(payload, fmt, repo) if handler else []
+
+
+def handle_issue_comment(payload, fmt, repo):
+    if payload['action'] != 'created':
+        return []
+    return [fmt_issue_comment_summary_message(payload, fmt, repo) + " " + fmt.url(payload['comment']['html_url'])]
+
+
+def handle_gollum(payload, fmt, repo):
+    url = payload['pages'][0]['html_url'] if len(payload['pages']) else payload['repository']['url'] + '/wiki'
+    return [fmt_gollum_summary_message(payload, fmt, repo) + " " + fmt.url(url)]
+
+
+def handle_watch(payload, fmt, repo):
+    return [fmt_watch_message(payload, fmt, repo)]
+
+
+def handle_status(payload, fmt, repo):
+    return [fmt_status_message(payload, fmt, repo)]
+
+
+def handle_release(payload, fmt, repo):
+    if payload['action'] != 'published':
+        # Currently the only possible action, but other events might eventually fire webhooks too
+        return []
+    return [fmt_release_message(payload, fmt, repo) + " " + fmt.url(payload['release']['html_url'])]
+
+
+PULL_REQUEST_ACTION_HANDLERS = {
+    **dict.fromkeys(OPEN_CLOSE_ACTIONS | READY_ACTIONS, handle_pull_request_state),
+    'edited': handle_pull_request_edit,
+    **dict.fromkeys(ASSIGN_ACTIONS, handle_assignment),
+    **dict.fromkeys(LABEL_ACTIONS, handle_labeling),
+}
+
+ISSUE_ACTION_HANDLERS = {
+    **dict.fromkeys(OPEN_CLOSE_ACTIONS, handle_issue_state),
+    **dict.fromkeys(ASSIGN_ACTIONS, handle_assignment),
+    **dict.fromkeys(LABEL_ACTIONS, handle_labeling),
+    **dict.fromkeys(MILESTONE_ACTIONS, handle_milestoning),
+    'edited': handle_issue_edit,
+    'transferred': handle_issue_transfer,
+}
+
+EVENT_HANDLERS = {
+    'push': handle_push,
+    'commit_comment': handle_commit_comment,
+    'pull_request': handle_pull_request,
+    'pull_request_review': handle_pull_request_review,
+    'pull_request_review_comment': handle_pull_request_review_comment,
+    'issues': handle_issues,
+    'issue_comment': handle_issue_comment,
+    'gollum': handle_gollum,
+    'watch': handle_watch,
+    'status': handle_status,
+    'release': handle_release,
+}
+
+
+def get_formatted_response(payload, row):
+    handler = EVENT_HANDLERS.get(payload['event'])
+    if handler is None:
+        return []
+    fmt = bind_row(row)
+    # every message starts with the repo name; color it just once
+    return handler(payload, fmt, fmt.repo(payload['repository']['name']))
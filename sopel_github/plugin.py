@@ -14,24 +14,34 @@ Copyright 2019 dgw
 from __future__ import annotations
 
 import base64
-from collections import deque
+from collections import OrderedDict
 from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 import datetime
-import json
+import heapq
 import operator
 import re
 import requests
+from requests.adapters import HTTPAdapter
 import sys
+import threading
+import time
 
 from sopel import plugin, tools
 from sopel.formatting import bold, color, monospace
 from sopel.tools.time import get_timezone, format_time, seconds_to_human
 from sopel.config.types import BooleanAttribute, StaticSection, ValidatedAttribute
+from urllib3.util.retry import Retry
 
 from . import formatting
 from .formatting import emojize
 from .webhook import setup_webhook, shutdown_webhook
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 if sys.version_info.major < 3:
     from urllib import urlencode
@@ -68,10 +78,29 @@ baseURL = (
         repo=githubRepoSlug
     )
 )
-repoURL = baseURL + r'/?(?:#.*|(?!\S))'
-issueURL = baseURL + r'/(?:issues|pull)/(?P<num>[\d]+)(?:#issuecomment-(?P<eventID>[\d]+))?'
-commitURL = baseURL + r'/(?:commit)/(?P<commit>[A-z0-9\-]+)'
-contentURL = baseURL + r'/(?:blob|raw)/(?P<ref>[^/\s]+)/(?P<path>[^#\s]+)(?:#L(?P<start>\d+)(?:-L(?P<end>\d+))?)?'
+# what can follow baseURL in each kind of link github_url() handles
+issuePath = r'/(?:issues|pull)/(?P<num>[\d]+)(?:#issuecomment-(?P<eventID>[\d]+))?'
+commitPath = r'/(?:commit)/(?P<commit>[A-z0-9\-]+)'
+contentPath = r'/(?:blob|raw)/(?P<ref>[^/\s]+)/(?P<path>[^#\s]+)(?:#L(?P<start>\d+)(?:-L(?P<end>\d+))?)?'
+repoPath = r'/?(?:#.*|(?!\S))'
+# compiled once at import, as one pattern so each URL seen in chat is scanned
+# once for the shared prefix; flags match what Sopel would use for the same
+# patterns given as strings (URL rules are case-sensitive, find rules are not)
+githubURL = re.compile(
+    baseURL + '(?:' + '|'.join((issuePath, commitPath, contentPath, repoPath)) + ')'
+)
+issueReference = re.compile(
+    r'(?<![\w\/\.])(?:\b(?:(?P<user>{match_user})\/)?(?P<repo>{match_repo}))?(?<![\/\.])#(?P<num>\d+)\b'
+    .format(match_user=githubUsername, match_repo=githubRepoSlug),
+    re.IGNORECASE,
+)
+# the `user/repo` form .gh-hook expects; rules out full URLs, too
+hookRepo = re.compile(r'^[^/\s:]+/[^/\s:]+$')
+# pieces common to most responses
+GITHUB_PREFIX = bold('[GitHub]')
+SEPARATOR = bold(' | ')
+# for the top three languages and "Other", in that order
+LANGUAGE_COLORS = ('12', '13', '09', '08')
 
 
 class GitHubSection(StaticSection):
@@ -104,6 +133,7 @@ def setup(sopel):
 
 def shutdown(sopel):
     shutdown_webhook(sopel)
+    EXECUTOR.shutdown(wait=False)
 
 
 '''
@@ -115,7 +145,46 @@ def shutdown(sopel):
 '''
 
 
-def fetch_api_endpoint(bot, url):
+# one pooled session for all API calls, so consecutive lookups reuse the
+# same keep-alive connection instead of doing a new TLS handshake each time
+SESSION = requests.Session()
+SESSION.headers['User-Agent'] = 'sopel-github (+https://github.com/sopel-irc/sopel-github)'
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False),
+))
+# for issuing independent API calls side by side
+EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='sopel-github')
+API_HEADERS = {
+    'Accept': 'application/vnd.github+json',
+    'X-GitHub-Api-Version': '2022-11-28',
+}
+# url -> (etag, body) of recent responses, least recently used first; lets
+# repeat lookups revalidate with a conditional request instead of re-fetching
+ETAG_CACHE = OrderedDict()
+ETAG_CACHE_SIZE = 512
+# bounds on what the bodies may add up to, since some (file contents, for
+# one) run to hundreds of KB; bigger responses are simply not kept
+ETAG_CACHE_MAX_BYTES = 8 * 1024 * 1024
+ETAG_CACHE_MAX_BODY = 256 * 1024
+ETAG_CACHE_BYTES = 0
+ETAG_CACHE_LOCK = threading.Lock()
+# (repo, sha) -> the few fields commit_info() shows; see fetch_commit()
+COMMIT_CACHE = OrderedDict()
+COMMIT_CACHE_SIZE = 2048
+COMMIT_CACHE_LOCK = threading.Lock()
+# last result from githubstatus.com, which rarely changes; see fetch_github_status()
+STATUS_CACHE = {'time': 0.0, 'etag': None, 'description': None}
+STATUS_CACHE_TTL = 30  # seconds
+# how much base64 to decode at a time when looking for a line in a file;
+# must be a multiple of 4
+FILE_DECODE_CHUNK = 64 * 1024
+
+
+def fetch_api_endpoint(bot, url, cache=True):
+    global ETAG_CACHE_BYTES
+
     # GitHub deprecated passing authentication via query parameters in November
     # 2019. Passing OAuth client credentials as user/password instead is the
     # supported replacement:
@@ -123,13 +192,67 @@ def fetch_api_endpoint(bot, url):
     auth = None
     if bot.config.github.client_id and bot.config.github.client_secret:
         auth = (bot.config.github.client_id, bot.config.github.client_secret)
-    return requests.get(url, headers={'X-GitHub-Api-Version': '2022-11-28'}, auth=auth).text
+
+    headers = API_HEADERS
+    cached = None
+    if cache:
+        with ETAG_CACHE_LOCK:
+            cached = ETAG_CACHE.get(url)
+    if cached:
+        headers = {**API_HEADERS, 'If-None-Match': cached[0]}
+
+    response = SESSION.get(url, headers=headers, auth=auth, timeout=(3, 10))
+
+    # a 304 has no body and doesn't count against the rate limit
+    if response.status_code == 304 and cached:
+        with ETAG_CACHE_LOCK:
+            if url in ETAG_CACHE:
+                ETAG_CACHE.move_to_end(url)
+        return cached[1]
+
+    body = response.content
+    etag = response.headers.get('ETag')
+    if cache and response.status_code == 200:
+        with ETAG_CACHE_LOCK:
+            # whatever was cached is out of date now, even if the new body
+            # turns out to be too big to keep
+            old = ETAG_CACHE.pop(url, None)
+            if old:
+                ETAG_CACHE_BYTES -= len(old[1])
+            if etag and len(body) <= ETAG_CACHE_MAX_BODY:
+                ETAG_CACHE[url] = (etag, body)
+                ETAG_CACHE_BYTES += len(body)
+                while len(ETAG_CACHE) > ETAG_CACHE_SIZE or ETAG_CACHE_BYTES > ETAG_CACHE_MAX_BYTES:
+                    _, (_, evicted) = ETAG_CACHE.popitem(last=False)
+                    ETAG_CACHE_BYTES -= len(evicted)
+
+    return body
+
+
+def fetch_github_status():
+    """
+    Get GitHub's overall status description, reusing it for a little while.
+    """
+    now = time.monotonic()
+    if STATUS_CACHE['description'] is None or now - STATUS_CACHE['time'] > STATUS_CACHE_TTL:
+        headers = {}
+        if STATUS_CACHE['description'] is not None and STATUS_CACHE['etag']:
+            headers['If-None-Match'] = STATUS_CACHE['etag']
+        response = SESSION.get('https://www.githubstatus.com/api/v2/status.json', headers=headers, timeout=(3, 5))
+        if response.status_code == 304:
+            # unchanged since we last looked; keep the description we have
+            STATUS_CACHE['time'] = now
+        else:
+            current = json_loads(response.content)
+            STATUS_CACHE.update(
+                time=now,
+                etag=response.headers.get('ETag'),
+                description=current['status']['description'],
+            )
+    return STATUS_CACHE['description']
 
 
-@plugin.find(
-    r'(?<![\w\/\.])(?:\b(?:(?P<user>{match_user})\/)?(?P<repo>{match_repo}))?(?<![\/\.])#(?P<num>\d+)\b'
-    .format(match_user=githubUsername, match_repo=githubRepoSlug)
-)
+@plugin.find(issueReference)
 @plugin.require_chanmsg
 def issue_reference(bot, trigger):
     """
@@ -138,7 +261,21 @@ def issue_reference(bot, trigger):
     issue_info(bot, trigger, suppress_errors=True)
 
 
-@plugin.url(issueURL)
+@plugin.url(githubURL)
+def github_url(bot, trigger, match=None):
+    """
+    Hand a GitHub link off to whichever lookup its matched groups call for.
+    """
+    match = match or trigger
+    if match.group('num'):
+        return issue_info(bot, trigger, match)
+    if match.group('commit'):
+        return commit_info(bot, trigger, match)
+    if match.group('path'):
+        return file_info(bot, trigger, match)
+    return repo_info(bot, trigger, match)
+
+
 def issue_info(bot, trigger, match=None, suppress_errors=False):
     user = trigger.group('user')
     repo = trigger.group('repo')
@@ -177,10 +314,11 @@ def issue_info(bot, trigger, match=None, suppress_errors=False):
 
     try:
         raw = fetch_api_endpoint(bot, URL)
-    except HTTPError:
-        bot.say('[GitHub] API returned an error.')
+    except (HTTPError, requests.RequestException):
+        if not suppress_errors:
+            bot.say('[GitHub] API returned an error.')
         return plugin.NOLIMIT
-    data = json.loads(raw)
+    data = json_loads(raw)
     try:
         body = data['body']
     except (KeyError):
@@ -192,7 +330,7 @@ def issue_info(bot, trigger, match=None, suppress_errors=False):
 
     # what we have so far
     response = [
-        bold('[GitHub]'),
+        GITHUB_PREFIX,
         ' [',
         '%s/%s' % (user, repo),
         ' #',
@@ -223,7 +361,7 @@ def issue_info(bot, trigger, match=None, suppress_errors=False):
         ])
 
     # reunited once again; the rest of the output format is common
-    now = datetime.datetime.utcnow()  # can't use trigger.time until it becomes Aware in Sopel 8
+    now = datetime.datetime.now(datetime.timezone.utc)  # can't use trigger.time until it becomes Aware in Sopel 8
     created_at = from_utc(data['created_at'])
     response.extend([
         ' by ',
@@ -236,12 +374,12 @@ def issue_info(bot, trigger, match=None, suppress_errors=False):
     if ('title' in data):
         # (well, *almost* common)
         response.append(emojize(data['title']))
-        response.append(bold(' | '))
+        response.append(SEPARATOR)
     response.append(emojize(body))
 
     # append link, if not triggered by a link
     if not match:
-        response.append(bold(' | '))
+        response.append(SEPARATOR)
         response.append(data['html_url'])
 
     bot.say(''.join(response))
@@ -276,62 +414,111 @@ def manage_channel_repo(bot, trigger):
     bot.reply('Set linked repo for %s to %s.' % (trigger.sender, trigger.group(3)))
 
 
-@plugin.url(commitURL)
+def fetch_commit(bot, repo, ref):
+    """
+    Fetch a commit's summary, remembering it if it was looked up by SHA.
+
+    Returns ``None`` if the API didn't return a commit. Commits are
+    immutable, so unlike other lookups these never need to go back to the
+    API once seen. Only the fields ``commit_info`` shows are kept; a full
+    commit response can carry megabytes of patches.
+    """
+    key = (repo.lower(), ref.lower())
+    with COMMIT_CACHE_LOCK:
+        data = COMMIT_CACHE.get(key)
+        if data is not None:
+            COMMIT_CACHE.move_to_end(key)
+            return data
+
+    URL = 'https://api.github.com/repos/%s/commits/%s' % (repo, ref)
+    # SHA lookups are kept below in a much smaller form than the raw body
+    data = json_loads(fetch_api_endpoint(bot, URL, cache=False))
+
+    if not isinstance(data, Mapping) or 'commit' not in data:
+        return None
+
+    commit = data['commit']
+    # only the first line is shown, so only split up to the first '\n'; the
+    # line can still end sooner, at a lone '\r' or a Unicode line break
+    message = commit['message']
+    end = message.find('\n')
+    lines = (message[:end] if end >= 0 else message).splitlines()
+    first = lines[0] if lines else ''
+    # anything past that line's own terminator means there's more
+    rest = message[len(first):]
+    rest = rest[2:] if rest.startswith('\r\n') else rest[1:]
+    summary = {
+        'title': first + ('…' if rest else ''),
+        'author': data['author']['login'] if data['author'] else commit['author']['name'],
+        'authored': from_utc(commit['author']['date']),
+        'committed': from_utc(commit['committer']['date']),
+        'changes': data['stats']['total'],
+        'files': len(data['files']),
+    }
+
+    sha = data.get('sha')
+    # only cache SHA lookups; a branch or tag name can point elsewhere later
+    if sha and sha.startswith(key[1]):
+        with COMMIT_CACHE_LOCK:
+            for k in {key, (key[0], sha)}:
+                COMMIT_CACHE[k] = summary
+                COMMIT_CACHE.move_to_end(k)
+            while len(COMMIT_CACHE) > COMMIT_CACHE_SIZE:
+                COMMIT_CACHE.popitem(last=False)
+
+    return summary
+
+
 def commit_info(bot, trigger, match=None):
     match = match or trigger
     repo = '%s/%s' % (match.group('user'), match.group('repo'))
-    URL = 'https://api.github.com/repos/%s/commits/%s' % (repo, match.group('commit'))
 
     try:
-        raw = fetch_api_endpoint(bot, URL)
-    except HTTPError:
+        data = fetch_commit(bot, repo, match.group('commit'))
+    except (HTTPError, requests.RequestException):
         bot.say('[GitHub] API returned an error.')
         return plugin.NOLIMIT
-    data = json.loads(raw)
-    try:
-        lines = data['commit']['message'].splitlines()
-        if len(lines) > 1:
-            body = lines[0] + '…'
-        elif len(lines) > 0:
-            body = lines[0]
-        else:
-            body = ''
-    except (KeyError):
+    if data is None:
         bot.say('[GitHub] API says this is an invalid commit. Please report this if you know it\'s a correct link!')
         return plugin.NOLIMIT
 
+    body = data['title']
+
     if body.strip() == '':
         body = 'No commit message provided.'
 
-    now = datetime.datetime.utcnow()  # can't use trigger.time until it becomes Aware in Sopel 8
-    author_date = from_utc(data['commit']['author']['date'])
-    committer_date = from_utc(data['commit']['committer']['date'])
+    now = datetime.datetime.now(datetime.timezone.utc)  # can't use trigger.time until it becomes Aware in Sopel 8
+    change_count = data['changes']
+    file_count = data['files']
+    author = data['author']
+    authored = seconds_to_human((now - data['authored']).total_seconds())
+    committed = seconds_to_human((now - data['committed']).total_seconds())
+    bot.say(
+        f"{GITHUB_PREFIX} [{repo}] {author}: {body}"
+        f"{SEPARATOR}{change_count} {('changes', 'change')[change_count == 1]}"
+        f" in {file_count} {('files', 'file')[file_count == 1]}"
+        f"{SEPARATOR}Authored {authored}{SEPARATOR}Committed {committed}"
+    )
 
-    change_count = data['stats']['total']
-    file_count = len(data['files'])
-    response = [
-        bold('[GitHub]'),
-        ' [',
-        repo,
-        '] ',
-        data['author']['login'] if data['author'] else data['commit']['author']['name'],
-        ': ',
-        body,
-        bold(' | '),
-        str(change_count),
-        ' change' if change_count == 1 else ' changes',
-        ' in ',
-        str(file_count),
-        ' file' if file_count == 1 else ' files',
-        bold(' | '),
-        'Authored ' + seconds_to_human((now - author_date).total_seconds()),
-        bold(' | '),
-        'Committed ' + seconds_to_human((now - committer_date).total_seconds()),
-    ]
-    bot.say(''.join(response))
+
+def get_file_line(content, number):
+    """
+    Get line ``number`` of a file from its base64 ``content``.
+
+    Decodes only as much of the file as it takes to reach that line.
+    """
+    encoded = content.replace('\n', '')
+    chunks = []
+    newlines = 0
+    for start in range(0, len(encoded), FILE_DECODE_CHUNK):
+        chunk = base64.b64decode(encoded[start:start + FILE_DECODE_CHUNK])
+        chunks.append(chunk)
+        newlines += chunk.count(b'\n')
+        if 0 < number <= newlines:
+            break
+    return b''.join(chunks).splitlines()[number - 1]
 
 
-@plugin.url(contentURL)
 def file_info(bot, trigger, match=None):
     match = match or trigger
     repo = '%s/%s' % (match.group('user'), match.group('repo'))
@@ -344,17 +531,17 @@ def file_info(bot, trigger, match=None):
 
     try:
         raw = fetch_api_endpoint(bot, URL)
-    except HTTPError:
+    except (HTTPError, requests.RequestException):
         bot.say('[GitHub] API returned an error.')
         return plugin.NOLIMIT
-    data = json.loads(raw)
+    data = json_loads(raw)
 
     if not isinstance(data, Mapping) or data.get('type', 'fakenews') != 'file':
         # silently ignore directory contents (and unexpected responses) for now
         return plugin.NOLIMIT
 
     response = [
-        bold('[GitHub]'),
+        GITHUB_PREFIX,
         ' [',
         repo,
         '] ',
@@ -364,10 +551,8 @@ def file_info(bot, trigger, match=None):
     ]
 
     if start_line:
-        lines = base64.b64decode(data['content']).splitlines()
-
         try:
-            snippet = lines[int(start_line) - 1].decode('utf-8')
+            snippet = get_file_line(data['content'], int(start_line)).decode('utf-8')
         except (IndexError, UnicodeDecodeError):
             # Line doesn't exist, or not a text file
             snippet = None
@@ -387,30 +572,33 @@ def file_info(bot, trigger, match=None):
 def get_data(bot, trigger, URL):
     URL = URL.split('#')[0]
     try:
+        # the two lookups don't depend on each other; run them concurrently
+        pending = EXECUTOR.submit(fetch_api_endpoint, bot, URL + '/languages')
         raw = fetch_api_endpoint(bot, URL)
-        rawLang = fetch_api_endpoint(bot, URL + '/languages')
-    except HTTPError:
+        rawLang = pending.result()
+    except (HTTPError, requests.RequestException):
         bot.say('[GitHub] API returned an error.')
         return plugin.NOLIMIT
-    data = json.loads(raw)
-    langData = list(json.loads(rawLang).items())
-    langData = sorted(langData, key=operator.itemgetter(1), reverse=True)
+    data = json_loads(raw)
+    langData = json_loads(rawLang)
 
     if 'message' in data:
         return bot.say('[GitHub] %s' % data['message'])
 
-    langColors = deque(['12', '08', '09', '13'])
-
-    max = sum([pair[1] for pair in langData])
+    # only the three biggest are shown by name
+    top = heapq.nlargest(3, langData.items(), key=operator.itemgetter(1))
+    total = sum(langData.values())
 
-    data['language'] = ''
-    for (key, val) in langData[:3]:
-        data['language'] = data['language'] + color(str("{0:.1f}".format(float(val) / max * 100)) + '% ' + key, langColors[0]) + ' '
-        langColors.rotate()
+    language = []
+    for i, (key, val) in enumerate(top):
+        language.append(color(f'{val / total * 100:.1f}% {key}', LANGUAGE_COLORS[i]))
+        language.append(' ')
 
     if len(langData) > 3:
-        remainder = sum([pair[1] for pair in langData[3:]])
-        data['language'] = data['language'] + color(str("{0:.1f}".format(float(remainder) / max * 100)) + '% Other', langColors[0]) + ' '
+        remainder = total - sum(val for _, val in top)
+        language.append(color(f'{remainder / total * 100:.1f}% Other', LANGUAGE_COLORS[3]))
+        language.append(' ')
+    data['language'] = ''.join(language)
 
     timezone = get_timezone(bot.db, bot.config, None, trigger.nick)
     if not timezone:
@@ -420,10 +608,9 @@ def get_data(bot, trigger, URL):
     return data
 
 
-@plugin.url(repoURL)
 def repo_info(bot, trigger, match=None):
     URL = 'https://api.github.com/repos/%s/%s' % (match.group('user'), match.group('repo'))
-    fmt_response(bot, trigger, URL, True)
+    return fmt_response(bot, trigger, URL, True)
 
 
 @plugin.command('github', 'gh')
@@ -450,62 +637,52 @@ def github_repo(bot, trigger):
         # This was previously more complex, but broke sometime before June 2024.
         # It could be re-improved using other API endpoints documented here:
         # https://www.githubstatus.com/api
-        current = json.loads(requests.get('https://www.githubstatus.com/api/v2/status.json').text)
-        return bot.say('[GitHub] Current Status: ' + current['status']['description'])
+        try:
+            return bot.say('[GitHub] Current Status: ' + fetch_github_status())
+        except requests.RequestException:
+            bot.say('[GitHub] API returned an error.')
+            return plugin.NOLIMIT
     elif repo.lower() == 'rate-limit':
-        return bot.say(fetch_api_endpoint(bot, 'https://api.github.com/rate_limit'))
+        try:
+            return bot.say(fetch_api_endpoint(bot, 'https://api.github.com/rate_limit').decode('utf-8'))
+        except requests.RequestException:
+            bot.say('[GitHub] API returned an error.')
+            return plugin.NOLIMIT
 
     if '/' not in repo:
         repo = trigger.nick.strip() + '/' + repo
     URL = 'https://api.github.com/repos/%s' % (repo.strip())
 
-    fmt_response(bot, trigger, URL)
+    return fmt_response(bot, trigger, URL)
 
 
-def from_utc(utcTime, fmt="%Y-%m-%dT%H:%M:%SZ"):
+def from_utc(utcTime):
     """
-    Convert UTC time string to time.struct_time
+    Convert GitHub's ISO 8601 UTC time string to an aware datetime
     """
-    return datetime.datetime.strptime(utcTime, fmt)
+    # fromisoformat() only accepts the "Z" suffix itself from Python 3.11
+    return datetime.datetime.fromisoformat(utcTime.replace('Z', '+00:00'))
 
 
 def fmt_response(bot, trigger, URL, from_regex=False):
     data = get_data(bot, trigger, URL)
 
-    if not data:
-        return
-
-    response = [
-        bold('[GitHub]'),
-        ' ',
-        str(data['full_name'])
-    ]
-
-    if data['description'] != None:
-        response.append(' - ' + str(emojize(data['description'])))
-
-    if not data['language'].strip() == '':
-        response.extend([' | ', data['language'].strip()])
-
-    response.extend([
-        ' | Last Push: ',
-        str(data['pushed_at']),
-        ' | Stargazers: ',
-        str(data['stargazers_count']),
-        ' | Watchers: ',
-        str(data['subscribers_count']),
-        ' | Forks: ',
-        str(data['forks_count']),
-        ' | Network: ',
-        str(data['network_count']),
-        ' | Open Issues: ',
-        str(data['open_issues'])
-    ])
-
-    if not from_regex:
-        response.extend([' | ', data['html_url']])
-
-    bot.say(''.join(response))
+    # get_data() has already replied if the lookup failed
+    if not isinstance(data, dict):
+        return data
+
+    description = data['description']
+    desc = '' if description is None else f" - {emojize(description)}"
+    language = data['language'].strip()
+    lang = f" | {language}" if language else ''
+    tail = '' if from_regex else f" | {data['html_url']}"
+
+    bot.say(
+        f"{GITHUB_PREFIX} {data['full_name']}{desc}{lang}"
+        f" | Last Push: {data['pushed_at']} | Stargazers: {data['stargazers_count']}"
+        f" | Watchers: {data['subscribers_count']} | Forks: {data['forks_count']}"
+        f" | Network: {data['network_count']} | Open Issues: {data['open_issues']}{tail}"
+    )
 
 
 @plugin.command('gh-hook')
@@ -526,7 +703,7 @@ def configure_repo_messages(bot, trigger):
     channel = trigger.sender.lower()
     repo_name = trigger.group(3).lower()
 
-    if not '/' in repo_name or 'http://' in repo_name or 'https://' in repo_name:
+    if not hookRepo.match(repo_name):
         return bot.say('Invalid repo formatting, see "{}help gh-hook" for an example'.format(bot.config.core.help_prefix))
 
     enabled = True if not trigger.group(4) or trigger.group(4).lower() == 'enable' else False
@@ -540,10 +717,9 @@ def configure_repo_messages(bot, trigger):
     conn = bot.db.connect()
     c = conn.cursor()
 
-    c.execute('SELECT * FROM gh_hooks WHERE channel = ? AND repo_name = ?', (channel, repo_name))
-    result = c.fetchone()
-    if not result:
-        c.execute('''INSERT INTO gh_hooks (channel, repo_name, enabled) VALUES (?, ?, ?)''', (channel, repo_name, enabled))
+    # a row that already exists is ignored here, and gets updated below instead
+    c.execute('''INSERT OR IGNORE INTO gh_hooks (channel, repo_name, enabled) VALUES (?, ?, ?)''', (channel, repo_name, enabled))
+    if c.rowcount == 1:
         bot.say("Successfully enabled listening for {repo}'s events in {chan}.".format(chan=channel, repo=repo_name))
         bot.say('Great! Please allow me to create my webhook by authorizing via this link:')
         bot.say(auth_url, max_messages=10)
@@ -575,10 +751,10 @@ def configure_repo_colors(bot, trigger):
 
     channel = trigger.sender.lower()
     repo_name = trigger.group(3).lower()
-    colors = []
+    # the first token is the repo name; everything after it should be colors
     try:
-        colors = [int(c) % 16 for c in trigger.group(2).replace(trigger.group(3), '', 1).split()]
-    except:
+        colors = [int(c) & 0xF for c in trigger.group(2).split()[1:]]
+    except ValueError:
         return bot.say('You must provide exactly 6 colors that are integers and are space separated. See "{}help gh-hook-color" for more information.'.format(bot.config.core.help_prefix))
 
     if len(colors) != 6:
@@ -587,23 +763,22 @@ def configure_repo_colors(bot, trigger):
     conn = bot.db.connect()
     c = conn.cursor()
 
-    c.execute('SELECT * FROM gh_hooks WHERE channel = ? AND repo_name = ?', (channel, repo_name))
-    result = c.fetchone()
-    if not result:
+    repo_color, name_color, branch_color, tag_color, hash_color, url_color = colors
+    c.execute('''UPDATE gh_hooks SET repo_color = ?, name_color = ?, branch_color = ?, tag_color = ?,
+                 hash_color = ?, url_color = ? WHERE channel = ? AND repo_name = ?''', (*colors, channel, repo_name))
+    updated = c.rowcount
+    conn.commit()
+    conn.close()
+
+    if not updated:
         return bot.say('Please use "{}gh-hook {} enable" before attempting to configure colors!'.format(bot.config.core.help_prefix, repo_name))
-    else:
-        combined = colors
-        combined.append(channel)
-        combined.append(repo_name)
-        c.execute('''UPDATE gh_hooks SET repo_color = ?, name_color = ?, branch_color = ?, tag_color = ?,
-                     hash_color = ?, url_color = ? WHERE channel = ? AND repo_name = ?''', combined)
-        conn.commit()
-        c.execute('SELECT * FROM gh_hooks WHERE channel = ? AND repo_name = ?', (channel, repo_name))
-        row = c.fetchone()
-        bot.say("[{}] Example name: {} tag: {} commit: {} branch: {} url: {}".format(
-                formatting.fmt_repo(repo_name, row),
-                formatting.fmt_name(trigger.nick, row),
-                formatting.fmt_tag('tag', row),
-                formatting.fmt_hash('c0mm17', row),
-                formatting.fmt_branch('master', row),
-                formatting.fmt_url('http://git.io/', row)))
+
+    # no need to read the row back; the colors are all it's used for
+    row = (channel, repo_name, True, url_color, tag_color, repo_color, name_color, hash_color, branch_color)
+    bot.say("[{}] Example name: {} tag: {} commit: {} branch: {} url: {}".format(
+            formatting.fmt_repo(repo_name, row),
+            formatting.fmt_name(trigger.nick, row),
+            formatting.fmt_tag('tag', row),
+            formatting.fmt_hash('c0mm17', row),
+            formatting.fmt_branch('master', row),
+            formatting.fmt_url('http://git.io/', row)))
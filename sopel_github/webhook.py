@@ -29,10 +29,14 @@ from threading import Thread
 import bottle
 import json
 import requests
+import sys
 
 # Because I'm a horrible person
 sopel_instance = None
 
+# (connect, read) seconds for the calls made while setting up a hook
+AUTH_TIMEOUT = (3, 10)
+
 def setup_webhook(sopel):
     global sopel_instance
     sopel_instance = sopel
@@ -54,6 +58,10 @@ def setup_webhook(sopel):
     except Exception:
         create_table(sopel, c)
         conn.commit()
+    # get_targets() looks hooks up by repo alone, which the primary key
+    # (channel first) can't serve; existing tables need this too
+    c.execute('CREATE INDEX IF NOT EXISTS gh_hooks_repo_name ON gh_hooks (repo_name)')
+    conn.commit()
     conn.close()
 
 
@@ -111,11 +119,12 @@ def get_targets(repo):
 
 def process_payload(payload, targets):
     if payload['event'] == 'ping':
+        repo = payload['repository']['name']
+        sender = payload['sender']['login']
         for row in targets:
-            sopel_instance.say('[{}] {}: {} (Your webhook is now enabled)'.format(
-                          fmt_repo(payload['repository']['name'], row),
-                          fmt_name(payload['sender']['login'], row),
-                          payload['zen']), row[0])
+            sopel_instance.say(
+                f"[{fmt_repo(repo, row)}] {fmt_name(sender, row)}: {payload['zen']} (Your webhook is now enabled)",
+                row[0])
         return
 
     for row in targets:
@@ -137,7 +146,11 @@ def webhook():
     except:
         return bottle.abort(400, 'Something went wrong!')
 
-    payload['event'] = bottle.request.headers.get('X-GitHub-Event') or 'ping'
+    # intern the dispatch keys once per delivery, so the handler table and
+    # action checks compare by identity for every subscribed channel
+    payload['event'] = sys.intern(bottle.request.headers.get('X-GitHub-Event') or 'ping')
+    if isinstance(payload.get('action'), str):
+        payload['action'] = sys.intern(payload['action'])
     targets = get_targets(payload['repository']['full_name'])
 
     # process hook payload in background
@@ -153,14 +166,13 @@ def handle_auth_response():
     code = bottle.request.query.code
     state = bottle.request.query.state
 
-    repo = state.split(':')[0]
-    channel = state.split(':')[1]
+    repo, _, channel = state.partition(':')
 
     data = {'client_id': sopel_instance.config.github.client_id,
             'client_secret': sopel_instance.config.github.client_secret,
             'code': code}
-    raw = requests.post('https://github.com/login/oauth/access_token', data=data, headers={'Accept': 'application/json'})
     try:
+        raw = requests.post('https://github.com/login/oauth/access_token', data=data, headers={'Accept': 'application/json'}, timeout=AUTH_TIMEOUT)
         res = json.loads(raw.text)
 
         if 'error' in res:
@@ -182,7 +194,7 @@ def handle_auth_response():
             }
         }
 
-        raw = requests.post('https://api.github.com/repos/{}/hooks?access_token={}'.format(repo, access_token), data=json.dumps(data))
+        raw = requests.post('https://api.github.com/repos/{}/hooks?access_token={}'.format(repo, access_token), data=json.dumps(data), timeout=AUTH_TIMEOUT)
         res = json.loads(raw.text)
 
         if 'ping_url' not in res:
@@ -191,7 +203,7 @@ def handle_auth_response():
             else:
                 raise ValueError('Webhook creation failed, try again.')
 
-        raw = requests.get(res['ping_url'] + '?access_token={}'.format(access_token))
+        raw = requests.get(res['ping_url'] + '?access_token={}'.format(access_token), timeout=AUTH_TIMEOUT)
 
         title = 'Done!'
         header = 'Webhook setup complete!'
@@ -0,0 +1,649 @@
+from __future__ import annotations
+
+import unittest
+
+from sopel_github import formatting
+
+# channel, repo_name, enabled, then url/tag/repo/name/hash/branch colors
+ROW = ('#channel', 'sopel-irc/sopel-github', True, 2, 6, 13, 15, 14, 6)
+
+
+class TestShortCommentBody(unittest.TestCase):
+    def testEmpty(self):
+        self.assertEqual(formatting.fmt_short_comment_body(None), '(empty comment)')
+        self.assertEqual(formatting.fmt_short_comment_body('  \n '), '(empty comment)')
+
+    def testSingleShortLine(self):
+        self.assertEqual(formatting.fmt_short_comment_body('Looks good to me! '), 'Looks good to me!')
+
+    def testSingleShortLineAbbreviatesHashes(self):
+        self.assertEqual(
+            formatting.fmt_short_comment_body('Fixed in ' + 'abcdef0' + '1' * 33),
+            'Fixed in abcdef0')
+
+    def testSkipsQuotesAndHeadings(self):
+        body = '> what about this?\r\n\r\n## Answer\r\nIt works now.'
+        self.assertEqual(formatting.fmt_short_comment_body(body), 'It works now.')
+
+    def testMarksMoreLines(self):
+        body = '<!-- template -->\nFirst line\n\nSecond line\nThird line'
+        self.assertEqual(formatting.fmt_short_comment_body(body), 'First line […]')
+
+    def testSkipsWhitespaceOnlyLines(self):
+        self.assertEqual(formatting.fmt_short_comment_body('   \nhello'), 'hello')
+        self.assertEqual(formatting.fmt_short_comment_body('hello\n \t \n'), 'hello')
+
+    def testOnlySkippedLines(self):
+        self.assertEqual(formatting.fmt_short_comment_body('> just a quote'), '(no body text)')
+
+    def testTruncatesAtWordBoundary(self):
+        short = formatting.fmt_short_comment_body('word ' * 60)
+        self.assertTrue(short.endswith('word […]'))
+        self.assertLessEqual(len(short), 250 + len(' […]'))
+
+    def testTruncatesUnbrokenLine(self):
+        self.assertEqual(formatting.fmt_short_comment_body('x' * 300), 'x' * 250 + ' […]')
+
+
+class TestCommitMessage(unittest.TestCase):
+    def short(self, message):
+        commit = {'message': message, 'author': {'name': 'dgw'}, 'id': 'abcdef0' + '1' * 33}
+        return formatting.fmt_commit_message(commit, formatting.bind_row(ROW), 'repo/branch').split(': ', 1)[1]
+
+    def testSingleLine(self):
+        self.assertEqual(self.short('Fix the thing'), 'Fix the thing')
+
+    def testMultipleLines(self):
+        self.assertEqual(self.short('Fix the thing\n\nBecause reasons'), 'Fix the thing…')
+        self.assertEqual(self.short('Fix the thing\r\nBecause reasons'), 'Fix the thing…')
+        self.assertEqual(self.short('Fix the thing\n'), 'Fix the thing…')
+
+    def testOtherLineBreaks(self):
+        self.assertEqual(self.short('fix\rdetails'), 'fix…')
+        self.assertEqual(self.short('fix\u2028details\nmore'), 'fix…')
+
+
+class TestGollumSummary(unittest.TestCase):
+    def payload(self, pages):
+        return {
+            'sender': {'login': 'dgw'},
+            'pages': pages,
+        }
+
+    def testSinglePage(self):
+        fmt = formatting.bind_row(ROW)
+        payload = self.payload([{'action': 'edited', 'title': 'Home', 'summary': 'typo'}])
+        self.assertEqual(
+            formatting.fmt_gollum_summary_message(payload, fmt, 'sopel-github'),
+            '[sopel-github] {} edited wiki page Home: typo'.format(formatting.fmt_name('dgw', ROW)))
+
+    def testMultiplePages(self):
+        # used to raise TypeError for any event touching more than one page
+        fmt = formatting.bind_row(ROW)
+        payload = self.payload([
+            {'action': 'edited', 'title': 'Home', 'summary': None},
+            {'action': 'created', 'title': 'FAQ', 'summary': None},
+            {'action': 'edited', 'title': 'Setup', 'summary': None},
+        ])
+        self.assertEqual(
+            formatting.fmt_gollum_summary_message(payload, fmt, 'sopel-github'),
+            '[sopel-github] {} created 1 and edited 2 wiki pages'.format(formatting.fmt_name('dgw', ROW)))
+
+
+# colors for url, tag, repo, name, hash, branch; all different, so a wrong
+# slot shows up in the expected output
+GOLDEN_ROW = ('#channel', 'sopel-irc/sopel-github', True, 2, 3, 4, 5, 6, 7)
+
+ZERO_SHA = '0' * 40
+BEFORE_SHA = 'b' * 40
+AFTER_SHA = 'a' * 40
+REPOSITORY = {'name': 'sopel-github', 'full_name': 'sopel-irc/sopel-github',
+              'url': 'https://github.com/sopel-irc/sopel-github'}
+
+
+def commit(n, message='Fix the thing', distinct=True):
+    sha = str(n) * 40
+    return {
+        'id': sha,
+        'url': 'https://github.com/sopel-irc/sopel-github/commit/' + sha,
+        'message': message,
+        'distinct': distinct,
+        'author': {'name': 'Author %s' % n},
+    }
+
+
+def event(name, action=None, **fields):
+    payload = {'event': name, 'repository': REPOSITORY, 'sender': {'login': 'dgw'}}
+    if action is not None:
+        payload['action'] = action
+    payload.update(fields)
+    return payload
+
+
+def push(**fields):
+    payload = event(
+        'push',
+        ref='refs/heads/master',
+        base_ref=None,
+        before=BEFORE_SHA,
+        after=AFTER_SHA,
+        created=False,
+        deleted=False,
+        forced=False,
+        pusher={'name': 'dgw'},
+        compare='https://github.com/sopel-irc/sopel-github/compare/bbbbbbb...aaaaaaa',
+        commits=[commit(1), commit(2, 'Add the other thing\n\nWith details')],
+    )
+    payload.update(fields)
+    return payload
+
+
+ISSUE = {
+    'number': 42,
+    'title': 'Something broke',
+    'html_url': 'https://github.com/sopel-irc/sopel-github/issues/42',
+    'user': {'login': 'reporter'},
+}
+PULL_REQUEST = {
+    'number': 43,
+    'title': 'Fix what broke',
+    'html_url': 'https://github.com/sopel-irc/sopel-github/pull/43',
+    'user': {'login': 'contributor'},
+    'merged': False,
+    'draft': False,
+    'base': {'ref': 'master', 'user': {'login': 'sopel-irc'}},
+    'head': {'ref': 'fix-it', 'user': {'login': 'sopel-irc'}},
+}
+REVIEW = {
+    'state': 'approved',
+    'body': None,
+    'user': {'login': 'dgw'},
+    'html_url': 'https://github.com/sopel-irc/sopel-github/pull/43#pullrequestreview-1',
+}
+RELEASE = {
+    'name': 'Version 1.0',
+    'tag_name': 'v1.0',
+    'prerelease': False,
+    'author': {'login': 'dgw'},
+    'html_url': 'https://github.com/sopel-irc/sopel-github/releases/tag/v1.0',
+}
+
+
+class GoldenTestCase(unittest.TestCase):
+    """
+    Checks complete webhook output, so refactors have something to diff against.
+    """
+    def assertFormatted(self, payload, expected):
+        self.assertEqual(formatting.get_formatted_response(payload, GOLDEN_ROW), expected)
+
+
+class TestPushEvents(GoldenTestCase):
+    def testPush(self):
+        payload = push()
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 pushed \x022\x0f new commits to \x0307master\x03 '
+            '\x0302https://github.com/sopel-irc/sopel-github/compare/bbbbbbb...aaaaaaa\x03',
+            '\x0304sopel-github\x03/\x0307master\x03 \x03061111111\x03 \x0305Author 1\x03: Fix the thing',
+            '\x0304sopel-github\x03/\x0307master\x03 \x03062222222\x03 \x0305Author 2\x03: Add the other thing…',
+        ])
+
+    def testPushSingleCommit(self):
+        payload = push(commits=[commit(1)])
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 pushed \x021\x0f new commit to \x0307master\x03 '
+            '\x0302https://github.com/sopel-irc/sopel-github/commit/1111111111111111111111111111111111111111\x03',
+            '\x0304sopel-github\x03/\x0307master\x03 \x03061111111\x03 \x0305Author 1\x03: Fix the thing',
+        ])
+
+    def testPushForced(self):
+        payload = push(forced=True)
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 \x0304force-pushed\x0f \x0307master\x03 from \x0306bbbbbbb\x03 to \x0306aaaaaaa\x03 '
+            '\x0302https://github.com/sopel-irc/sopel-github/commits/master\x03',
+            '\x0304sopel-github\x03/\x0307master\x03 \x03061111111\x03 \x0305Author 1\x03: Fix the thing',
+            '\x0304sopel-github\x03/\x0307master\x03 \x03062222222\x03 \x0305Author 2\x03: Add the other thing…',
+        ])
+
+    def testPushCreatedBranch(self):
+        payload = push(created=True, before=ZERO_SHA, commits=[])
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 created \x0307master\x03 at \x0306aaaaaaa\x03 (+\x020\x0f new commit) '
+            '\x0302https://github.com/sopel-irc/sopel-github/compare/bbbbbbb...aaaaaaa\x03',
+        ])
+
+    def testPushCreatedBranchWithCommits(self):
+        payload = push(created=True, before=ZERO_SHA)
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 created \x0307master\x03 (+\x022\x0f new commits) '
+            '\x0302https://github.com/sopel-irc/sopel-github/compare/bbbbbbb...aaaaaaa\x03',
+            '\x0304sopel-github\x03/\x0307master\x03 \x03061111111\x03 \x0305Author 1\x03: Fix the thing',
+            '\x0304sopel-github\x03/\x0307master\x03 \x03062222222\x03 \x0305Author 2\x03: Add the other thing…',
+        ])
+
+    def testPushCreatedBranchFromBase(self):
+        payload = push(
+            created=True,
+            before=ZERO_SHA,
+            base_ref='refs/heads/master',
+            ref='refs/heads/feature',
+            commits=[commit(1, distinct=False)],
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 created \x0307feature\x03 from \x0307master\x03 (+\x020\x0f new commit) '
+            '\x0302https://github.com/sopel-irc/sopel-github/compare/bbbbbbb...aaaaaaa\x03',
+        ])
+
+    def testPushTag(self):
+        payload = push(
+            created=True,
+            before=ZERO_SHA,
+            ref='refs/tags/v1.0',
+            base_ref='refs/heads/master',
+            commits=[],
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 tagged \x0303v1.0\x03 at \x0307master\x03 '
+            '\x0302https://github.com/sopel-irc/sopel-github/compare/bbbbbbb...aaaaaaa\x03',
+        ])
+
+    def testPushTagWithoutBase(self):
+        payload = push(created=True, before=ZERO_SHA, ref='refs/tags/v1.0', commits=[])
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 tagged \x0303v1.0\x03 at \x0306aaaaaaa\x03 '
+            '\x0302https://github.com/sopel-irc/sopel-github/compare/bbbbbbb...aaaaaaa\x03',
+        ])
+
+    def testPushDeletedBranch(self):
+        payload = push(deleted=True, after=ZERO_SHA, commits=[])
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 \x0304deleted\x0f \x0307master\x03 at \x0306bbbbbbb\x03 '
+            '\x0302https://github.com/sopel-irc/sopel-github/commit/bbbbbbb\x03',
+        ])
+
+    def testPushMerge(self):
+        payload = push(
+            base_ref='refs/heads/feature',
+            commits=[commit(1, distinct=False), commit(2, distinct=False)],
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 merged \x0307feature\x03 into \x0307master\x03 '
+            '\x0302https://github.com/sopel-irc/sopel-github/compare/bbbbbbb...aaaaaaa\x03',
+        ])
+
+    def testPushFastForward(self):
+        payload = push(commits=[commit(1, distinct=False)])
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 fast-forwarded \x0307master\x03 from \x0306bbbbbbb\x03 to \x0306aaaaaaa\x03 '
+            '\x0302https://github.com/sopel-irc/sopel-github/compare/bbbbbbb...aaaaaaa\x03',
+        ])
+
+
+class TestIssuesEvents(GoldenTestCase):
+    def testIssueOpened(self):
+        payload = event('issues', 'opened', issue=ISSUE)
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 opened issue #42: Something broke '
+            '\x0302https://github.com/sopel-irc/sopel-github/issues/42\x03',
+        ])
+
+    def testIssueClosed(self):
+        payload = event('issues', 'closed', issue=ISSUE)
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 closed issue #42: Something broke '
+            '\x0302https://github.com/sopel-irc/sopel-github/issues/42\x03',
+        ])
+
+    def testIssueReopened(self):
+        payload = event('issues', 'reopened', issue=ISSUE)
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 reopened issue #42: Something broke '
+            '\x0302https://github.com/sopel-irc/sopel-github/issues/42\x03',
+        ])
+
+    def testIssueRetitled(self):
+        payload = event('issues', 'edited', issue=ISSUE, changes={'title': {'from': 'Old title'}})
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 retitled issue #42: "Old title" ➜ "Something broke" '
+            '\x0302https://github.com/sopel-irc/sopel-github/issues/42\x03',
+        ])
+
+    def testIssueBodyEditIgnored(self):
+        payload = event('issues', 'edited', issue=ISSUE, changes={'body': {'from': 'Old body'}})
+        self.assertFormatted(payload, [])
+
+    def testIssueAssigned(self):
+        payload = event('issues', 'assigned', issue=ISSUE, assignee={'login': 'helper'})
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 assigned issue #42 to \x0305helper\x03 (Something broke) '
+            '\x0302https://github.com/sopel-irc/sopel-github/issues/42\x03',
+        ])
+
+    def testIssueSelfAssigned(self):
+        payload = event('issues', 'assigned', issue=ISSUE, assignee={'login': 'dgw'})
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 self-assigned issue #42 (Something broke) '
+            '\x0302https://github.com/sopel-irc/sopel-github/issues/42\x03',
+        ])
+
+    def testIssueUnassigned(self):
+        payload = event('issues', 'unassigned', issue=ISSUE, assignee={'login': 'helper'})
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 unassigned issue #42 from \x0305helper\x03 (Something broke) '
+            '\x0302https://github.com/sopel-irc/sopel-github/issues/42\x03',
+        ])
+
+    def testIssueLabeled(self):
+        payload = event('issues', 'labeled', issue=ISSUE, label={'name': 'Bug'})
+        self.assertFormatted(payload, [
+            "[\x0304sopel-github\x03] \x0305dgw\x03 added the label 'Bug' to issue #42 (Something broke) "
+            "\x0302https://github.com/sopel-irc/sopel-github/issues/42\x03",
+        ])
+
+    def testIssueUnlabeled(self):
+        payload = event('issues', 'unlabeled', issue=ISSUE, label={'name': 'Bug'})
+        self.assertFormatted(payload, [
+            "[\x0304sopel-github\x03] \x0305dgw\x03 removed the label 'Bug' from issue #42 (Something broke) "
+            "\x0302https://github.com/sopel-irc/sopel-github/issues/42\x03",
+        ])
+
+    def testIssueLabeledWithoutLabelIgnored(self):
+        payload = event('issues', 'labeled', issue=ISSUE)
+        self.assertFormatted(payload, [])
+
+    def testIssueMilestoned(self):
+        payload = event('issues', 'milestoned', issue=ISSUE, milestone={'title': '0.6.0'})
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 added issue #42 (Something broke) to the 0.6.0 milestone '
+            '\x0302https://github.com/sopel-irc/sopel-github/issues/42\x03',
+        ])
+
+    def testIssueDemilestoned(self):
+        payload = event('issues', 'demilestoned', issue=ISSUE, milestone={'title': '0.6.0'})
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 removed issue #42 (Something broke) from the 0.6.0 milestone '
+            '\x0302https://github.com/sopel-irc/sopel-github/issues/42\x03',
+        ])
+
+    def testIssueTransferredOut(self):
+        payload = event(
+            'issues',
+            'transferred',
+            issue=ISSUE,
+            changes={'new_repository': {'full_name': 'sopel-irc/sopel'}, 'new_issue': {'number': 7, 'html_url': 'https://github.com/sopel-irc/sopel/issues/7'}},
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 transferred issue #42 by \x0305reporter\x03 to \x0304sopel-irc/sopel\x03#7: Something broke '
+            '\x0302https://github.com/sopel-irc/sopel/issues/7\x03',
+        ])
+
+    def testIssueTransferredIn(self):
+        payload = event(
+            'issues',
+            'opened',
+            issue=ISSUE,
+            changes={'old_repository': {'full_name': 'sopel-irc/sopel'}, 'old_issue': {'number': 7}},
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0304sopel-irc/sopel\x03#7 by \x0305reporter\x03 was transferred to issue #42: Something broke '
+            '\x0302https://github.com/sopel-irc/sopel-github/issues/42\x03',
+        ])
+
+    def testIssueUnhandledActionIgnored(self):
+        payload = event('issues', 'pinned', issue=ISSUE)
+        self.assertFormatted(payload, [])
+
+
+class TestPullRequestEvents(GoldenTestCase):
+    def testPullRequestOpened(self):
+        payload = event('pull_request', 'opened', pull_request=PULL_REQUEST)
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 opened pull request #43: Fix what broke (\x0307master\x03...\x0307fix-it\x03) '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43\x03',
+        ])
+
+    def testPullRequestOpenedFromFork(self):
+        payload = event(
+            'pull_request',
+            'opened',
+            pull_request=dict(PULL_REQUEST, head={'ref': 'fix-it', 'user': {'login': 'contributor'}}),
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 opened pull request #43: Fix what broke (\x0305sopel-irc\x03:\x0307master\x03...\x0305contributor\x03:\x0307fix-it\x03) '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43\x03',
+        ])
+
+    def testPullRequestDrafted(self):
+        payload = event('pull_request', 'opened', pull_request=dict(PULL_REQUEST, draft=True))
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 drafted pull request #43: Fix what broke (\x0307master\x03...\x0307fix-it\x03) '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43\x03',
+        ])
+
+    def testPullRequestReadied(self):
+        payload = event('pull_request', 'ready_for_review', pull_request=PULL_REQUEST)
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 readied pull request #43: Fix what broke (\x0307master\x03...\x0307fix-it\x03) '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43\x03',
+        ])
+
+    def testPullRequestUnreadied(self):
+        payload = event('pull_request', 'converted_to_draft', pull_request=PULL_REQUEST)
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 un-readied pull request #43: Fix what broke (\x0307master\x03...\x0307fix-it\x03) '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43\x03',
+        ])
+
+    def testPullRequestClosed(self):
+        payload = event('pull_request', 'closed', pull_request=PULL_REQUEST)
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 closed pull request #43: Fix what broke (\x0307master\x03...\x0307fix-it\x03) '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43\x03',
+        ])
+
+    def testPullRequestMerged(self):
+        payload = event('pull_request', 'closed', pull_request=dict(PULL_REQUEST, merged=True))
+        self.assertFormatted(payload, [
+            "[\x0304sopel-github\x03] \x0305dgw\x03 merged \x0305contributor\x03's pull request #43: Fix what broke (\x0307master\x03...\x0307fix-it\x03) "
+            "\x0302https://github.com/sopel-irc/sopel-github/pull/43\x03",
+        ])
+
+    def testPullRequestMergedByAuthor(self):
+        payload = event(
+            'pull_request',
+            'closed',
+            sender={'login': 'contributor'},
+            pull_request=dict(PULL_REQUEST, merged=True),
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305contributor\x03 merged pull request #43: Fix what broke (\x0307master\x03...\x0307fix-it\x03) '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43\x03',
+        ])
+
+    def testPullRequestRetitled(self):
+        payload = event(
+            'pull_request',
+            'edited',
+            pull_request=PULL_REQUEST,
+            changes={'title': {'from': 'WIP'}},
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 retitled PR #43: "WIP" ➜ "Fix what broke" '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43\x03',
+        ])
+
+    def testPullRequestBodyEditIgnored(self):
+        payload = event(
+            'pull_request',
+            'edited',
+            pull_request=PULL_REQUEST,
+            changes={'body': {'from': 'Old body'}},
+        )
+        self.assertFormatted(payload, [])
+
+    def testPullRequestAssigned(self):
+        payload = event(
+            'pull_request',
+            'assigned',
+            pull_request=PULL_REQUEST,
+            assignee={'login': 'helper'},
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 assigned pull request #43 to \x0305helper\x03 (Fix what broke) '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43\x03',
+        ])
+
+    def testPullRequestLabeled(self):
+        payload = event(
+            'pull_request',
+            'labeled',
+            pull_request=PULL_REQUEST,
+            label={'name': 'Bug'},
+        )
+        self.assertFormatted(payload, [
+            "[\x0304sopel-github\x03] \x0305dgw\x03 added the label 'Bug' to pull request #43 (Fix what broke) "
+            "\x0302https://github.com/sopel-irc/sopel-github/pull/43\x03",
+        ])
+
+    def testPullRequestLabeledWithoutLabelIgnored(self):
+        payload = event('pull_request', 'labeled', pull_request=PULL_REQUEST)
+        self.assertFormatted(payload, [])
+
+    def testPullRequestUnhandledActionIgnored(self):
+        payload = event('pull_request', 'synchronize', pull_request=PULL_REQUEST)
+        self.assertFormatted(payload, [])
+
+
+class TestReviewEvents(GoldenTestCase):
+    def testReviewApproved(self):
+        payload = event(
+            'pull_request_review',
+            'submitted',
+            pull_request=PULL_REQUEST,
+            review=REVIEW,
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 approved pull request #43 '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43#pullrequestreview-1\x03',
+        ])
+
+    def testReviewChangesRequested(self):
+        payload = event(
+            'pull_request_review',
+            'submitted',
+            pull_request=PULL_REQUEST,
+            review=dict(REVIEW, state='changes_requested', body='Needs tests.\nAnd docs.'),
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 requested changes on pull request #43: Needs tests. […] '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43#pullrequestreview-1\x03',
+        ])
+
+    def testReviewCommented(self):
+        payload = event(
+            'pull_request_review',
+            'submitted',
+            pull_request=PULL_REQUEST,
+            review=dict(REVIEW, state='commented', body='Looks fine'),
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 left a review on pull request #43: Looks fine '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43#pullrequestreview-1\x03',
+        ])
+
+    def testReviewEmptyCommentIgnored(self):
+        payload = event(
+            'pull_request_review',
+            'submitted',
+            pull_request=PULL_REQUEST,
+            review=dict(REVIEW, state='commented'),
+        )
+        self.assertFormatted(payload, [])
+
+    def testReviewDismissedOwn(self):
+        payload = event(
+            'pull_request_review',
+            'dismissed',
+            pull_request=PULL_REQUEST,
+            review=dict(REVIEW, state='dismissed'),
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 dismissed their review on pull request #43 '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43#pullrequestreview-1\x03',
+        ])
+
+    def testReviewDismissedOther(self):
+        payload = event(
+            'pull_request_review',
+            'dismissed',
+            pull_request=PULL_REQUEST,
+            review=dict(REVIEW, state='dismissed', user={'login': 'reviewer'}),
+        )
+        self.assertFormatted(payload, [
+            "[\x0304sopel-github\x03] \x0305dgw\x03 dismissed \x0305reviewer\x03's review on pull request #43 "
+            "\x0302https://github.com/sopel-irc/sopel-github/pull/43#pullrequestreview-1\x03",
+        ])
+
+    def testReviewComment(self):
+        payload = event(
+            'pull_request_review_comment',
+            'created',
+            pull_request=PULL_REQUEST,
+            comment={'body': 'Typo here', 'commit_id': AFTER_SHA, 'html_url': 'https://github.com/sopel-irc/sopel-github/pull/43#discussion_r1'},
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 left a file comment in pull request #43 \x0306aaaaaaa\x03: Typo here '
+            '\x0302https://github.com/sopel-irc/sopel-github/pull/43#discussion_r1\x03',
+        ])
+
+
+class TestStatusEvents(GoldenTestCase):
+    def testStatus(self):
+        # the first branch pointing at the commit wins
+        payload = event(
+            'status',
+            sha=AFTER_SHA,
+            state='success',
+            description='CI passed',
+            target_url='https://ci.example.com/1',
+            branches=[{'name': 'other', 'commit': {'sha': BEFORE_SHA}}, {'name': 'master', 'commit': {'sha': AFTER_SHA}}, {'name': 'copy', 'commit': {'sha': AFTER_SHA}}],
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03/\x0307master\x03] CI passed - https://ci.example.com/1 (success)',
+        ])
+
+    def testStatusUnknownBranch(self):
+        payload = event(
+            'status',
+            sha=AFTER_SHA,
+            state='failure',
+            description='CI failed',
+            target_url='https://ci.example.com/2',
+            branches=[],
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03/\x0307\x03] CI failed - https://ci.example.com/2 (failure)',
+        ])
+
+
+class TestReleaseEvents(GoldenTestCase):
+    def testRelease(self):
+        payload = event('release', 'published', release=RELEASE)
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 released Version 1.0 '
+            '\x0302https://github.com/sopel-irc/sopel-github/releases/tag/v1.0\x03',
+        ])
+
+    def testPrerelease(self):
+        payload = event(
+            'release',
+            'published',
+            release=dict(RELEASE, name='', tag_name='v1.1rc1', prerelease=True, html_url='https://github.com/sopel-irc/sopel-github/releases/tag/v1.1rc1'),
+        )
+        self.assertFormatted(payload, [
+            '[\x0304sopel-github\x03] \x0305dgw\x03 released v1.1rc1 (prerelease) '
+            '\x0302https://github.com/sopel-irc/sopel-github/releases/tag/v1.1rc1\x03',
+        ])
+
+    def testReleaseUnpublishedIgnored(self):
+        payload = event('release', 'created', release=RELEASE)
+        self.assertFormatted(payload, [])